@@ -11,37 +11,93 @@
 #
 #  See the LICENSE file for more details.
 
-import filecmp
+import functools
+import hashlib
 import os
-import shutil
+import stat
 import subprocess
+import sys
+import tempfile
 
-__all__: list[str] = ["_check_sudo", "_get_repo_root", "_install_common", "_install_file", "_install_service", "_install_sudo_exception", "_uninstall_service", "install_bin", "install_cmmn", "install_svc", "_get_actual_user"]
+__all__: list[str] = ["_check_sudo", "_get_repo_root", "_install_common", "_install_file", "_install_service", "_install_sudo_exception", "_uninstall_service", "flush_services", "install_bin", "install_cmmn", "install_svc", "_get_actual_user", "_BIN_PREFIX", "_CMMN_PREFIX", "_SVC_PREFIX", "_COMMON_LIBS"]
 
 install_bin = "/usr/local/sbin"
 install_svc = "/etc/systemd/system"
 install_cmmn = "/usr/local/sbin/common"
 
+# Resolved once so the re-exec skips the PATH walk execvp would do.
+_sudo_path = "/usr/bin/sudo" if os.access("/usr/bin/sudo", os.X_OK) else "/bin/sudo"
 
-def _get_args() -> list[str]:
-    """Retrieves command line arguments manually."""
-    with open("/proc/self/cmdline", "r") as f:
-        cmdline = f.read()
-    return [arg for arg in cmdline.split('\0') if arg]
+# Precomputed absolute-path prefixes; destinations are fixed, so plain
+# concatenation beats os.path.join on the per-file paths below.
+_BIN_PREFIX = install_bin + "/"
+_SVC_PREFIX = install_svc + "/"
+_CMMN_PREFIX = install_cmmn + "/"
+
+# Shared kwargs for systemctl invocations whose output is never parsed.
+_RUN_QUIET: dict = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "check": False}
+
+# Services written with defer=True, waiting for a single flush_services() call.
+_pending_units: list[tuple[str, bool]] = []
 
 
 def _check_sudo() -> None:
     """Re-executes the script with sudo if not already running as root."""
     if os.geteuid() != 0:
-        args: list[str] = ["sudo", "python3"] + _get_args()
-        os.execvp("sudo", args)
+        args: list[str] = ["sudo", sys.executable] + sys.argv
+        os.execv(_sudo_path, args)
 
 
+@functools.cache
 def _get_repo_root() -> str:
     """Returns the absolute path to the repository root."""
     return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+def _digest(path: str) -> bytes:
+    """Returns the blake2b digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").digest()
+
+
+def _fast_equal(src: str, dst: str, dst_st: os.stat_result | None = None) -> bool:
+    """Compares two files by stat signature, falling back to a content digest compare."""
+    s1 = os.stat(src)
+    s2 = dst_st if dst_st is not None else os.stat(dst)
+    if not (stat.S_ISREG(s1.st_mode) and stat.S_ISREG(s2.st_mode)):
+        return False
+    if s1.st_size != s2.st_size:
+        return False
+    if s1.st_mtime_ns == s2.st_mtime_ns:
+        return True
+    return _digest(src) == _digest(dst)
+
+
+def _copy_file(src: str, dst: str, mode: int) -> None:
+    """Copies src to dst in-kernel via sendfile, setting mode and ownership on the open fd."""
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        src_st = os.fstat(src_fd)
+        size = src_st.st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            os.fchmod(dst_fd, mode)
+            os.fchown(dst_fd, 0, 0)
+            # Carry the source mtime over so _fast_equal's stat signature
+            # matches on the next run instead of falling through to hashing.
+            os.utime(dst_fd, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
 def _install_file(src: str, dst: str, mode: int = 0o755, quiet: bool = False) -> bool:
     """Installs a file if it differs from destination or if destination is a symlink."""
     if not os.path.exists(src):
@@ -50,14 +106,20 @@ def _install_file(src: str, dst: str, mode: int = 0o755, quiet: bool = False) ->
 
     # Ensure destination directory exists
     dst_dir = os.path.dirname(dst)
-    if not os.path.exists(dst_dir):
+    try:
+        os.makedirs(dst_dir, mode=0o755)
         print(f"Creating directory {dst_dir}...")
-        os.makedirs(dst_dir, mode=0o755, exist_ok=True)
         os.chown(dst_dir, 0, 0)
+    except FileExistsError:
+        pass
 
-    is_symlink = os.path.islink(dst)
+    try:
+        dst_st = os.lstat(dst)
+    except FileNotFoundError:
+        dst_st = None
+    is_symlink = dst_st is not None and stat.S_ISLNK(dst_st.st_mode)
 
-    if not is_symlink and os.path.exists(dst) and filecmp.cmp(src, dst, shallow=False):
+    if not is_symlink and dst_st is not None and _fast_equal(src, dst, dst_st):
         if not quiet:
             print(f"File {dst} is identical. Skipping update.")
         return False
@@ -69,49 +131,65 @@ def _install_file(src: str, dst: str, mode: int = 0o755, quiet: bool = False) ->
             print(f"Installing {src} to {dst}...")
 
         try:
-            shutil.copy(src, dst)
-            os.chmod(dst, mode)
-            os.chown(dst, 0, 0)
+            _copy_file(src, dst, mode)
             return True
         except Exception as e:
             print(f"Error installing {dst}: {e}")
             return False
 
 
+# Files shipped to the shared common/ directory by _install_common.
+_COMMON_LIBS: tuple[str, ...] = ("t2.py", "t2_min.py")
+
+
 def _install_common() -> bool:
-    """Installs the common t2.py library."""
+    """Installs the common t2 libraries."""
     repo_root = _get_repo_root()
-    src = os.path.join(repo_root, "src", "common", "t2.py")
-    dst = os.path.join(install_cmmn, "t2.py")
-    return _install_file(src, dst, mode=0o644, quiet=True)
+    src_dir = os.path.join(repo_root, "src", "common")
+    changed = False
+    for name in _COMMON_LIBS:
+        if _install_file(os.path.join(src_dir, name), _CMMN_PREFIX + name, mode=0o644, quiet=True):
+            changed = True
+    return changed
 
 
-def _install_service(service_name: str, content: str, enable_now: bool = True, quiet: bool = False) -> bool:
+def _install_service(service_name: str, content: str, enable_now: bool = True, quiet: bool = False, defer: bool = False) -> bool:
     """Creates and manages systemd service."""
-    dst = os.path.join(install_svc, service_name)
-    content = content.strip() + "\n"
+    dst = _SVC_PREFIX + service_name
+    content_bytes = (content.strip() + "\n").encode()
 
-    if os.path.exists(dst):
-        with open(dst, "r") as f:
-            if f.read().strip() == content.strip():
+    try:
+        st = os.stat(dst)
+    except FileNotFoundError:
+        st = None
+    if st is not None and st.st_size == len(content_bytes):
+        with open(dst, "rb") as f:
+            if f.read() == content_bytes:
                 if not quiet:
                     print(f"Service {service_name} is identical. Skipping update.")
                 return False
 
     print(f"Creating {service_name} at {dst}...")
     try:
-        with open(dst, "w") as f:
-            f.write(content)
+        tmp = tempfile.NamedTemporaryFile("wb", dir=install_svc, delete=False)
+        with tmp:
+            tmp.write(content_bytes)
+            os.fchmod(tmp.fileno(), 0o644)
+        os.replace(tmp.name, dst)
+
+        if defer:
+            _pending_units.append((service_name, enable_now))
+            return True
 
         print("Reloading systemd...")
-        subprocess.run(["systemctl", "daemon-reload"])
+        subprocess.run(["systemctl", "daemon-reload"], **_RUN_QUIET)
 
         if enable_now:
             print(f"Enabling and starting {service_name}...")
-            subprocess.run(["systemctl", "enable", "--now", service_name])
+            subprocess.run(["systemctl", "enable", "--now", service_name], **_RUN_QUIET)
         else:
             print(f"Enabling {service_name}...")
-            subprocess.run(["systemctl", "enable", service_name])
+            subprocess.run(["systemctl", "enable", service_name], **_RUN_QUIET)
 
         return True
     except Exception as e:
@@ -119,24 +197,48 @@ def _install_service(service_name: str, content: str, enable_now: bool = True, q
         return False
 
 
+def flush_services() -> None:
+    """Reloads systemd once and enables all services deferred by _install_service."""
+    if not _pending_units:
+        return
+    print("Reloading systemd...")
+    subprocess.run(["systemctl", "daemon-reload"], **_RUN_QUIET)
+    now = [name for name, enable_now in _pending_units if enable_now]
+    later = [name for name, enable_now in _pending_units if not enable_now]
+    if now:
+        print(f"Enabling and starting {', '.join(now)}...")
+        subprocess.run(["systemctl", "enable", "--now"] + now, **_RUN_QUIET)
+    if later:
+        print(f"Enabling {', '.join(later)}...")
+        subprocess.run(["systemctl", "enable"] + later, **_RUN_QUIET)
+    _pending_units.clear()
+
+
 def _install_sudo_exception(exception_file: str, content: str) -> bool:
     """Installs a sudoers exception if content differs or file is missing."""
-    content = content.strip() + "\n"
+    content_bytes = (content.strip() + "\n").encode()
 
-    if os.path.exists(exception_file):
-        with open(exception_file, "r") as f:
-            if f.read().strip() == content.strip():
-                print(f"Sudoers exception {exception_file} is identical. Skipping update.")
-                return False
+    try:
+        st = os.stat(exception_file)
+    except FileNotFoundError:
+        st = None
+    if st is not None:
+        if st.st_size == len(content_bytes):
+            with open(exception_file, "rb") as f:
+                if f.read() == content_bytes:
+                    print(f"Sudoers exception {exception_file} is identical. Skipping update.")
+                    return False
         print(f"Updating sudoers exception: {exception_file}")
-        os.remove(exception_file)
     else:
         print(f"Creating sudoers exception: {exception_file}")
 
     try:
-        with open(exception_file, "w") as f:
-            f.write(content)
-        os.chmod(exception_file, 0o440)
+        tmp = tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(exception_file), delete=False)
+        with tmp:
+            tmp.write(content_bytes)
+            os.fchmod(tmp.fileno(), 0o440)
+            os.fchown(tmp.fileno(), 0, 0)
+        os.replace(tmp.name, exception_file)
         print("Sudoers exception installed successfully.")
         return True
     except Exception as e:
@@ -146,16 +248,17 @@ def _install_sudo_exception(exception_file: str, content: str) -> bool:
 
 def _uninstall_service(service_name: str) -> bool:
     """Stops, disables, and removes a systemd service."""
-    dst = os.path.join(install_svc, service_name)
+    dst = _SVC_PREFIX + service_name
     if os.path.exists(dst):
         print(f"Disabling and removing {service_name}...")
-        subprocess.run(["systemctl", "disable", "--now", service_name], capture_output=True)
+        subprocess.run(["systemctl", "disable", "--now", service_name], **_RUN_QUIET)
         os.remove(dst)
-        subprocess.run(["systemctl", "daemon-reload"], capture_output=True)
+        subprocess.run(["systemctl", "daemon-reload"], **_RUN_QUIET)
         return True
     return False
 
 
+@functools.cache
 def _get_actual_user() -> str:
     """Identifies the active user logged into the session."""
     sudo_user = os.environ.get("SUDO_USER")
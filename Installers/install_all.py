@@ -12,20 +12,28 @@
 #  See the LICENSE file for more details.
 
 import argparse
+import importlib
 import os
-import subprocess
-from common.core import _check_sudo, install_bin, install_cmmn
+from common.core import _check_sudo, _CMMN_PREFIX, _COMMON_LIBS, _install_common, flush_services, install_bin, install_cmmn
 
 
 def run_installers(action: str) -> None:
-    """Executes installer scripts with the specified action."""
-    installers: list[str] = ["Installers/install_brightness.py", "Installers/install_suspend.py", "Installers/install_wifi.py"]
+    """Runs each installer module in-process with the specified action."""
+    installers: list[str] = ["install_brightness", "install_suspend", "install_wifi"]
+    if action == "install":
+        _install_common()
     for installer in installers:
-        if os.path.exists(installer):
-            print(f"\n--- Running {installer} {action} ---")
-            subprocess.run(["python3", installer, action])
-        else:
-            print(f"Warning: {installer} not found.")
+        print(f"\n--- Running {installer} {action} ---")
+        try:
+            mod = importlib.import_module(installer)
+        except ImportError as e:
+            print(f"Warning: {installer} not available: {e}")
+            continue
+        if action == "install":
+            mod.install(skip_common=True, defer=True)
+        elif action == "uninstall":
+            mod.uninstall()
+    flush_services()
 
 
 def main() -> None:
@@ -42,19 +50,21 @@ def main() -> None:
         run_installers("install")
     elif action == "uninstall":
         run_installers("uninstall")
-        common_lib = os.path.join(install_cmmn, "t2.py")
-        if os.path.exists(common_lib):
-            print(f"Removing {common_lib}...")
-            os.remove(common_lib)
-        else:
-            print(f"Common library {common_lib} already removed.")
+        for name in _COMMON_LIBS:
+            common_lib = _CMMN_PREFIX + name
+            if os.path.exists(common_lib):
+                print(f"Removing {common_lib}...")
+                os.remove(common_lib)
+            else:
+                print(f"Common library {common_lib} already removed.")
     elif action == "reinstall":
         print("Starting reinstallation...")
         run_installers("uninstall")
-        common_lib = os.path.join(install_cmmn, "t2.py")
-        if os.path.exists(common_lib):
-            print(f"Removing {common_lib}...")
-            os.remove(common_lib)
+        for name in _COMMON_LIBS:
+            common_lib = _CMMN_PREFIX + name
+            if os.path.exists(common_lib):
+                print(f"Removing {common_lib}...")
+                os.remove(common_lib)
         run_installers("install")
         print("Reinstallation complete.")
 
@@ -14,32 +14,39 @@
 
 import argparse
 import os
-from common.core import _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_sudo_exception, install_bin, install_cmmn
+from common.core import _BIN_PREFIX, _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_sudo_exception, install_bin
 
-scripts: list[str] = ["bdp.py", "bkb.py", "btb.py"]
+script_src = "t2brightness.py"
+script_dst = "t2brightness"
+# Tool names installed as symlinks to the single t2brightness dispatcher.
+TOOL_NAMES: tuple[str, ...] = ("bdp", "bkb", "btb")
+
+_script_dir = os.path.join(_get_repo_root(), "src", "brightness")
 exception_file = "/etc/sudoers.d/0-brightness-control"
 exception_content = "{user} ALL=NOPASSWD: /usr/local/sbin/bdp, /usr/local/sbin/bkb, /usr/local/sbin/btb"
 
 
-def install() -> None:
-    """Installs brightness tools and common library."""
-    repo_root = _get_repo_root()
-    script_dir = os.path.join(repo_root, "src", "brightness")
-    common_src_dir = os.path.join(repo_root, "src", "common")
-
-    changed = _install_common()
+def install(skip_common: bool = False, defer: bool = False) -> None:
+    """Installs brightness tools and common library; defer is accepted for
+    uniform dispatch from install_all but unused (no services here)."""
+    changed = False if skip_common else _install_common()
 
-    for script in scripts:
-        if script == "__init__.py":
-            src = os.path.join(common_src_dir, script)
-            dst = os.path.join(install_cmmn, script)
-        else:
-            src = os.path.join(script_dir, script)
-            dst_name = script.replace(".py", "")
-            dst = os.path.join(install_bin, dst_name)
+    src = os.path.join(_script_dir, script_src)
+    if _install_file(src, _BIN_PREFIX + script_dst):
+        changed = True
 
-        if _install_file(src, dst):
-            changed = True
+    for name in TOOL_NAMES:
+        link = _BIN_PREFIX + name
+        try:
+            if os.readlink(link) == script_dst:
+                continue
+        except OSError:
+            pass
+        if os.path.lexists(link):
+            os.remove(link)
+        print(f"Linking {link} -> {script_dst}...")
+        os.symlink(script_dst, link)
+        changed = True
 
     if _install_sudo_exception(exception_file, exception_content.format(user=_get_actual_user())):
         changed = True
@@ -53,16 +60,14 @@ def install() -> None:
 def uninstall() -> None:
     """Removes installed brightness tools and sudoers exception."""
     changed = False
-    for script in scripts:
-        if script == "__init__.py":
-            dst = os.path.join(install_cmmn, script)
-        else:
-            dst_name = script.replace(".py", "")
-            dst = os.path.join(install_bin, dst_name)
-
-        if os.path.exists(dst):
-            print(f"Removing {dst}...")
-            os.remove(dst)
+    try:
+        installed = {entry.name for entry in os.scandir(install_bin)}
+    except FileNotFoundError:
+        installed = set()
+    for name in TOOL_NAMES + (script_dst,):
+        if name in installed:
+            print(f"Removing {_BIN_PREFIX + name}...")
+            os.remove(_BIN_PREFIX + name)
             changed = True
 
     if os.path.exists(exception_file):
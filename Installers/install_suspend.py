@@ -13,7 +13,7 @@
 
 import argparse
 import os
-from common.core import _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_service, _install_sudo_exception, _uninstall_service, install_bin
+from common.core import _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_service, _install_sudo_exception, _uninstall_service, _BIN_PREFIX, install_bin
 
 script_src = "suspendfix.py"
 script_dst = "suspendfix"
@@ -39,16 +39,16 @@ exception_file = "/etc/sudoers.d/1-suspendfix"
 exception_content = "{user} ALL=NOPASSWD: /usr/local/sbin/suspendfix"
 
 
-def install() -> None:
+def install(skip_common: bool = False, defer: bool = False) -> None:
     """Installs suspendfix and corresponding systemd service."""
     repo_root = _get_repo_root()
     script_dir = os.path.join(repo_root, "src", "suspend")
-    changed = _install_common()
+    changed = False if skip_common else _install_common()
     src: str = os.path.join(script_dir, script_src)
-    dst: str = os.path.join(install_bin, script_dst)
+    dst: str = _BIN_PREFIX + script_dst
     if _install_file(src, dst):
         changed = True
-    if _install_service(service_name, service_content, enable_now=False):
+    if _install_service(service_name, service_content, enable_now=False, defer=defer):
         changed = True
     if _install_sudo_exception(exception_file, exception_content.format(user=_get_actual_user())):
         changed = True
@@ -61,7 +61,7 @@ def install() -> None:
 
 def uninstall() -> None:
     """Removes suspendfix and stops/disables systemd service."""
-    dst: str = os.path.join(install_bin, script_dst)
+    dst: str = _BIN_PREFIX + script_dst
     changed = _uninstall_service(service_name)
     if os.path.exists(dst):
         print(f"Removing {dst}...")
@@ -13,7 +13,7 @@
 
 import argparse
 import os
-from common.core import _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_service, _install_sudo_exception, _uninstall_service, install_bin
+from common.core import _check_sudo, _get_actual_user, _get_repo_root, _install_common, _install_file, _install_service, _install_sudo_exception, _uninstall_service, _BIN_PREFIX, install_bin
 
 script_src = "WiFi-Monitor.py"
 script_dst = "WiFi-Monitor"
@@ -40,16 +40,16 @@ exception_file = "/etc/sudoers.d/2-wifi-monitor"
 exception_content = "{user} ALL=NOPASSWD: /usr/local/sbin/WiFi-Monitor"
 
 
-def install() -> None:
+def install(skip_common: bool = False, defer: bool = False) -> None:
     """Installs WiFi-Monitor and corresponding systemd service."""
     repo_root = _get_repo_root()
     script_dir = os.path.join(repo_root, "src", "wifi")
-    changed = _install_common()
+    changed = False if skip_common else _install_common()
     src: str = os.path.join(script_dir, script_src)
-    dst: str = os.path.join(install_bin, script_dst)
+    dst: str = _BIN_PREFIX + script_dst
     if _install_file(src, dst):
         changed = True
-    if _install_service(service_name, service_content, enable_now=True):
+    if _install_service(service_name, service_content, enable_now=True, defer=defer):
         changed = True
     if _install_sudo_exception(exception_file, exception_content.format(user=_get_actual_user())):
         changed = True
@@ -62,7 +62,7 @@ def install() -> None:
 
 def uninstall() -> None:
     """Removes WiFi-Monitor and stops/disables systemd service."""
-    dst: str = os.path.join(install_bin, script_dst)
+    dst: str = _BIN_PREFIX + script_dst
     changed = _uninstall_service(service_name)
     if os.path.exists(dst):
         print(f"Removing {dst}...")
@@ -0,0 +1,66 @@
+#!/usr/bin/env -S python3 -S
+#
+#  t2brightness
+#  T2_Linux
+#
+#  Created by turannul on 07/12/2025.
+#  Rewritten in Python on 07/02/2026.
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  See the LICENSE file for more details.
+#
+#  Single binary for bdp/bkb/btb, dispatched on the name it is invoked as;
+#  the installer symlinks the three tool names to this script.
+
+import os
+import sys
+from common.t2_min import _apply_brightness_percentage, _apply_brightness_stepped, _check_root, _find_device_path, _show_brightness, cRed, cReset, e_invalid_usage
+
+# (candidate device paths, apply function, human-readable device kind) per tool name.
+_TOOLS = {
+    "bdp": (["/sys/class/backlight/intel_backlight", "/sys/class/backlight/acpi_video0"], _apply_brightness_percentage, "display"),
+    "bkb": (["/sys/class/leds/apple::kbd_backlight"], _apply_brightness_percentage, "keyboard"),
+    "btb": (["/sys/class/backlight/appletb_backlight"], _apply_brightness_stepped, "touchbar"),
+}
+
+
+def main() -> None:
+    """Controls backlight brightness for the device the invoked name selects."""
+    _check_root()
+
+    name = os.path.basename(sys.argv[0])
+    if name.endswith(".py"):
+        name = name[:-3]
+    tool = _TOOLS.get(name)
+    if tool is None:
+        print(f"usage: invoke as one of {', '.join(_TOOLS)} (via symlink)")
+        sys.exit(e_invalid_usage)
+    device_paths, apply_brightness, kind = tool
+
+    arg = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if arg in ("-h", "--help"):
+        print(f"usage: {name} [-s | --show] [percentage]\nControls {kind} backlight brightness.")
+        sys.exit(0)
+
+    device_path = _find_device_path(device_paths)
+    if not device_path:
+        print(f"{cRed}Error: No supported {kind} backlight found.{cReset}")
+        sys.exit(e_invalid_usage)
+
+    if arg in ("-s", "--show"):
+        _show_brightness(device_path)
+        sys.exit(0)
+
+    if arg:
+        apply_brightness(arg, device_path)
+    else:
+        print(f"usage: {name} [-s | --show] [percentage]")
+        sys.exit(e_invalid_usage)
+
+
+if __name__ == "__main__":
+    main()
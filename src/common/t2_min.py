@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+#
+#  t2_min.py
+#  T2_Linux
+#
+#  Created by turannul on 07/02/2026.
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  See the LICENSE file for more details.
+#
+#  Minimal runtime for the brightness tools. Everything on their hot path
+#  lives here so a keybinding invocation never imports logging, subprocess
+#  or typing; t2.py re-exports these names for the remaining scripts.
+
+import atexit
+import os
+import stat
+import sys
+
+__all__: list[str] = ["cRed", "cGreen", "cYellow", "cReset", "_cGreen_b", "_cReset_b", "e_success", "e_failure", "e_invalid_usage", "_MSG_PCT_TOO_HIGH", "_MSG_PERMISSION_DENIED", "_sudo_path", "_fd_cache", "_dir_fd_cache", "_device_dir_fd", "_member_fd", "_close_cached_fds", "_stat_cache", "_cached_stat", "_get_args", "_check_root", "_path_cache", "_find_device_path", "_validate_device_path", "_source_fd", "_get_max_brightness", "_get_current_brightness", "_read_state", "_calculate_percentage", "_commit_brightness", "_validate_percentage", "_validate_raw_input", "_touchbar_calculate_new_level", "_touchbar_get_label", "_show_brightness", "_apply_brightness_percentage", "_apply_brightness_stepped", "_apply_brightness_raw"]
+
+cRed = "\033[0;31m"
+cGreen = "\033[0;32m"
+cYellow = "\033[1;33m"
+cReset = "\033[0m"
+
+# ANSI affixes pre-encoded for the single-syscall status write in _commit_brightness.
+_cGreen_b = cGreen.encode()
+_cReset_b = cReset.encode()
+
+e_success = 0
+e_failure = 1
+e_invalid_usage = 2
+
+# Static user-facing messages, assembled once at import instead of per error.
+_MSG_PCT_TOO_HIGH = f"{cRed}Error: Percentage cannot be greater than 100.{cReset}"
+_MSG_PERMISSION_DENIED = f"{cRed}Error: Permission denied. Please run with sudo.{cReset}"
+
+# Resolved once so the re-exec skips the PATH walk execvp would do.
+_sudo_path = "/usr/bin/sudo" if os.access("/usr/bin/sudo", os.X_OK) else "/bin/sudo"
+
+# Cached sysfs file descriptors keyed by (path, open flags); sysfs values can
+# be re-read with pread, so one open serves the whole process.
+_fd_cache: dict[tuple[str, int], int] = {}
+
+# Cached directory fds per device path so member files open via openat,
+# skipping the component-by-component walk of the full sysfs path.
+_dir_fd_cache: dict[str, int] = {}
+
+
+def _device_dir_fd(device_path: str) -> int:
+    """Returns a cached directory fd for a sysfs device path."""
+    fd = _dir_fd_cache.get(device_path)
+    if fd is None:
+        fd = os.open(device_path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        _dir_fd_cache[device_path] = fd
+    return fd
+
+
+def _member_fd(device_path: str, name: str, flags: int = os.O_RDONLY) -> int:
+    """Returns a cached fd for a device member file, opened relative to the device dir."""
+    key = (device_path + "/" + name, flags)
+    fd = _fd_cache.get(key)
+    if fd is None:
+        fd = os.open(name, flags | os.O_CLOEXEC, dir_fd=_device_dir_fd(device_path))
+        _fd_cache[key] = fd
+    return fd
+
+
+def _close_cached_fds() -> None:
+    """Closes all cached sysfs file descriptors."""
+    for fd in _fd_cache.values():
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    _fd_cache.clear()
+    for fd in _dir_fd_cache.values():
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    _dir_fd_cache.clear()
+
+
+atexit.register(_close_cached_fds)
+
+# Cached stat results (None marks a missing path); the sysfs layout does not
+# change within one process lifetime.
+_stat_cache: dict[str, os.stat_result | None] = {}
+
+
+def _cached_stat(path: str) -> os.stat_result | None:
+    """Returns a cached os.stat result for path, or None if it does not exist."""
+    if path in _stat_cache:
+        return _stat_cache[path]
+    try:
+        st: os.stat_result | None = os.stat(path)
+    except OSError:
+        st = None
+    _stat_cache[path] = st
+    return st
+
+
+def _get_args() -> list[str]:
+    """Retrieves command line arguments manually."""
+    with open("/proc/self/cmdline", "rb") as f:
+        raw = f.read()
+    # cmdline is null-separated; surrogateescape keeps non-UTF-8 argv intact
+    return [arg.decode("utf-8", "surrogateescape") for arg in raw.split(b"\x00") if arg]
+
+
+def _check_root() -> None:
+    """Checks if root and re-executes with sudo if not."""
+    if os.geteuid() != 0:
+        # If the process already holds CAP_SETUID (e.g. launched from a
+        # privileged wrapper), promote in place and skip the sudo re-exec.
+        try:
+            os.setuid(0)
+            return
+        except OSError:
+            pass
+        argv = _get_args()
+        script_path = os.path.abspath(argv[0])
+        if os.access(script_path, os.X_OK):
+            cmd = ["sudo", script_path] + argv[1:]
+        else:
+            cmd = ["sudo", "python3", script_path] + argv[1:]
+        os.execv(_sudo_path, cmd)
+
+
+# Resolved device paths keyed by the candidate tuple; None marks a probe that
+# found nothing so hot-plug misses are not re-probed within one process.
+_path_cache: dict[tuple[str, ...], str | None] = {}
+
+
+def _find_device_path(paths: list[str]) -> str | None:
+    """Finds the first existing directory from a list of paths."""
+    key = tuple(paths)
+    if key in _path_cache:
+        return _path_cache[key]
+    result: str | None = None
+    for path in paths:
+        st = _cached_stat(path)
+        if st is not None and stat.S_ISDIR(st.st_mode):
+            result = path
+            break
+    _path_cache[key] = result
+    return result
+
+
+def _validate_device_path(device_path: str) -> bool:
+    """Validates if the device path exists."""
+    st = _cached_stat(device_path) if device_path else None
+    if st is None or not stat.S_ISDIR(st.st_mode):
+        print(f"{cRed}Error: Device path '{device_path}' does not exist.{cReset}")
+        return False
+    return True
+
+
+def _source_fd(device_path: str, source_file: str | None = None) -> int:
+    """Opens and caches the brightness source fd, probing by open instead of stat."""
+    if source_file:
+        try:
+            return _member_fd(device_path, source_file)
+        except FileNotFoundError:
+            pass
+    try:
+        return _member_fd(device_path, "actual_brightness")
+    except FileNotFoundError:
+        return _member_fd(device_path, "brightness")
+
+
+# max_brightness is constant for the life of a kernel module; cache it under
+# /run (tmpfs) so later invocations skip the sysfs read. Cleared on reboot,
+# which is exactly when the value could change.
+_MAX_CACHE_DIR = "/run/t2-brightness"
+
+
+def _get_max_brightness(device_path: str) -> int:
+    """Reads the max_brightness value, preferring the tmpfs cache."""
+    cache = _MAX_CACHE_DIR + "/" + device_path.replace("/", "_") + ".max"
+    try:
+        fd = os.open(cache, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            return int(os.read(fd, 32))
+        finally:
+            os.close(fd)
+    except (OSError, ValueError):
+        pass
+    try:
+        fd = _member_fd(device_path, "max_brightness")
+        value = int(os.pread(fd, 32, 0))
+    except (IOError, ValueError):
+        return 0
+    try:
+        os.makedirs(_MAX_CACHE_DIR, exist_ok=True)
+        cfd = os.open(cache, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+        try:
+            os.write(cfd, str(value).encode())
+        finally:
+            os.close(cfd)
+    except OSError:
+        pass
+    return value
+
+
+def _get_current_brightness(device_path: str, source_file: str | None = None) -> int:
+    """Reads the current brightness value."""
+    try:
+        fd = _source_fd(device_path, source_file)
+        return int(os.pread(fd, 32, 0))
+    except (IOError, ValueError):
+        return 0
+
+
+def _read_state(device_path: str, source_file: str | None = None) -> tuple[int, int]:
+    """Reads the current and max brightness values in one pass."""
+    return _get_current_brightness(device_path, source_file), _get_max_brightness(device_path)
+
+
+def _calculate_percentage(current: int, max_val: int) -> int:
+    """Calculates the percentage of brightness."""
+    if max_val == 0:
+        return 0
+    return (current * 100) // max_val
+
+
+def _commit_brightness(value: int, device_path: str, old_label: str, new_label: str) -> bool:
+    """Writes the new brightness value and prints the change."""
+    try:
+        fd = _member_fd(device_path, "brightness", os.O_WRONLY)
+        os.pwrite(fd, str(value).encode(), 0)
+        os.write(1, _cGreen_b + f"{old_label} > {new_label}".encode() + _cReset_b + b"\n")
+        return True
+    except FileNotFoundError:
+        print(f"{cRed}Error: Brightness file not found in {device_path}.{cReset}")
+        return False
+    except PermissionError:
+        print(_MSG_PERMISSION_DENIED)
+        return False
+    except IOError as e:
+        print(f"{cRed}Error writing to brightness file: {e}{cReset}")
+        return False
+
+
+def _validate_percentage(input_str: str, current_pct: int) -> int:
+    """Validates the input percentage string."""
+    clean_input = input_str[:-1] if input_str.endswith("%") else input_str
+    if not clean_input.isdigit():
+        print(f"{cRed}Error: Invalid brightness value provided.{cReset}\n{cGreen}Current brightness: {current_pct}%{cReset}")
+        return -1
+    val = int(clean_input)
+    if val > 100:
+        print(_MSG_PCT_TOO_HIGH)
+        return -1
+    return val
+
+
+def _validate_raw_input(input_str: str, max_value: int) -> int:
+    """Validates raw integer input."""
+    if not input_str.isdigit():
+        return -1
+    val = int(input_str)
+    if val > max_value:
+        print(f"{cRed}Error: Maximum brightness is {max_value}.{cReset}")
+        return -1
+    return val
+
+
+def _touchbar_calculate_new_level(percentage: int) -> int:
+    """Calculates stepped level for touchbar."""
+    if percentage == 0:
+        return 0
+    elif percentage <= 49:
+        return 1
+    else:
+        return 2
+
+
+def _touchbar_get_label(level: int) -> str:
+    """Returns label for touchbar level."""
+    if level == 0:
+        return "0 (Off)"
+    elif level == 1:
+        return "1 (Dim)"
+    else:
+        return "2 (Bright)"
+
+
+def _show_brightness(device_path: str, brightness_source_file: str | None = None, print_output: bool = True) -> int:
+    """Displays current brightness percentage."""
+    if not _validate_device_path(device_path):
+        sys.exit(e_failure)
+    current_raw, max_value = _read_state(device_path, brightness_source_file)
+    pct = _calculate_percentage(current_raw, max_value)
+    if print_output:
+        print(f"{pct}%")
+    return pct
+
+
+def _apply_brightness_percentage(input_str: str, device_path: str, brightness_source_file: str | None = None) -> None:
+    """Applies brightness based on percentage."""
+    if not _validate_device_path(device_path):
+        sys.exit(e_failure)
+    current_raw, max_value = _read_state(device_path, brightness_source_file)
+    old_pct = _calculate_percentage(current_raw, max_value)
+    percentage = _validate_percentage(input_str, old_pct)
+    if percentage == -1:
+        sys.exit(e_failure)
+    new_level = (max_value * percentage) // 100
+    if new_level == current_raw:
+        return
+    _commit_brightness(new_level, device_path, f"{old_pct}%", f"{percentage}%")
+
+
+def _apply_brightness_stepped(input_str: str, device_path: str, brightness_source_file: str | None = None) -> None:
+    """Applies stepped brightness for touchbar."""
+    if not _validate_device_path(device_path):
+        sys.exit(e_failure)
+    current_raw, max_value = _read_state(device_path, brightness_source_file)
+    current_pct = _calculate_percentage(current_raw, max_value)
+    percentage = _validate_percentage(input_str, current_pct)
+    if percentage == -1:
+        sys.exit(e_failure)
+    new_level = _touchbar_calculate_new_level(percentage)
+    if new_level == current_raw:
+        return
+    old_label = _touchbar_get_label(current_raw)
+    new_label = _touchbar_get_label(new_level)
+    _commit_brightness(new_level, device_path, old_label, new_label)
+
+
+def _apply_brightness_raw(input_str: str, device_path: str, brightness_source_file: str | None = None) -> None:
+    """Applies raw brightness value."""
+    if not _validate_device_path(device_path):
+        sys.exit(e_failure)
+    current_val, max_value = _read_state(device_path, brightness_source_file)
+    val = _validate_raw_input(input_str, max_value)
+    if val == -1:
+        sys.exit(e_failure)
+    if val == current_val:
+        return
+    _commit_brightness(val, device_path, str(current_val), str(val))
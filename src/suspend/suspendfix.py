@@ -16,7 +16,7 @@ import argparse
 import logging
 import os
 import time
-from common.t2 import _check_root, _execute_command, _load_module, _log_event, _setup_logging, _start_service, _stop_service, _unload_module
+from common.t2 import _check_root, _execute_command, _load_module, _log_event, _setup_logging, _start_service, _start_services, _stop_service, _unload_module
 from typing import Optional
 
 version = "0.6.0"
@@ -31,7 +31,7 @@ def _log(char: str, msg: str) -> None:
 def _rescan_pci() -> bool:
     """Triggers a PCI bus rescan."""
     _log("*", "Rescanning PCI bus...")
-    _, _, code = _execute_command("echo 1 > /sys/bus/pci/rescan")
+    _, _, code = _execute_command("echo 1 > /sys/bus/pci/rescan", capture=False)
     return code == 0
 
 
@@ -40,14 +40,14 @@ def _remove_device(device_id: str, name: Optional[str] = None) -> bool:
     path = f"/sys/bus/pci/devices/{device_id}/remove"
     if os.path.exists(path):
         _log("*", f"Removing {name or device_id}...")
-        _, _, code = _execute_command(f"echo 1 > {path}")
+        _, _, code = _execute_command(f"echo 1 > {path}", capture=False)
         return code == 0
     return False
 
 
 def load_sequence() -> None:
     """Executes the driver load sequence after resume."""
-    _execute_command("notify-send 'Suspend Fix' 'Executing LOAD sequence' --urgency=normal --icon=view-refresh", as_user=True)
+    _execute_command("notify-send 'Suspend Fix' 'Executing LOAD sequence' --urgency=normal --icon=view-refresh", as_user=True, capture=False)
     _log("*", "Executing LOAD sequence...")
     _load_module("apple-bce", logger, delay=3)
     _load_module("hid_appletb_bl", logger)
@@ -57,17 +57,16 @@ def load_sequence() -> None:
     _load_module("hci_bcm4377", logger, delay=1)
     _rescan_pci()
     _load_module("thunderbolt", logger)
-    _start_service("pipewire.socket", logger, block=False, as_user=True)
+    _start_services(["pipewire.socket", "wluma.service"], logger, block=False, as_user=True)
     _start_service("tiny-dfr.service", logger, block=False, as_user=False)
-    _start_service("wluma.service", logger, block=False, as_user=True)
     _log("*", "Starting WiFi Monitor...")
-    _execute_command("/usr/local/sbin/WiFi-Monitor check")
+    _execute_command("/usr/local/sbin/WiFi-Monitor check", capture=False)
     _log("*", "LOAD sequence complete.")
 
 
 def unload_sequence() -> None:
     """Executes the driver unload sequence before suspend."""
-    _execute_command("notify-send 'Suspend Fix' 'Executing UNLOAD sequence' --urgency=normal --icon=view-refresh", as_user=True)
+    _execute_command("notify-send 'Suspend Fix' 'Executing UNLOAD sequence' --urgency=normal --icon=view-refresh", as_user=True, capture=False)
     _log("*", "Executing UNLOAD sequence...")
     _stop_service("wluma.service", logger, block=False, as_user=True)
     _stop_service("pipewire.socket", logger, block=True, as_user=True)
@@ -17,7 +17,7 @@ import os
 import re
 import subprocess
 import time
-from common.t2 import _check_root, _execute_command, _load_module, _log_event, _setup_logging, _unload_module
+from common.t2 import _check_root, _execute_command, _load_module, _load_modules, _log_event, _setup_logging, _unload_module, _unload_modules
 from typing import Pattern
 
 cd_sec: int = 20
@@ -32,6 +32,7 @@ def _log(char: str, msg: str) -> None:
 
 
 p_list: list[str] = [r"CMD_TRIGGER_SCAN.*error.*\(5\)", r"brcmf_msgbuf_query_dcmd", r"set wpa_auth failed", r"error \(-12\)"]
+compiled_p_list: list[Pattern[str]] = [re.compile(p, re.IGNORECASE) for p in p_list]
 
 
 def _unload_wifi() -> None:
@@ -58,8 +59,7 @@ def _unload_all() -> bool:
     """Unloads both Wi-Fi and Bluetooth drivers."""
     try:
         _log("+", "STAGE 1: Unloading drivers...")
-        _unload_wifi()
-        _unload_bt()
+        _unload_modules(["brcmfmac_wcc", "hci_bcm4377"], logger, delay=1)
         return True
     except Exception as err:
         _log("-", f"Unable to unload due: {err}")
@@ -70,8 +70,7 @@ def _load_all() -> bool:
     """Loads both Bluetooth and Wi-Fi drivers."""
     try:
         _log("+", "STAGE 2: Loading drivers...")
-        _load_bt()
-        _load_wifi()
+        _load_modules(["hci_bcm4377", "brcmfmac_wcc"], logger, delay=1)
         return True
     except Exception as err:
         _log("-", f"Unable to load due: {err}")
@@ -89,7 +88,7 @@ def verify_connectivity(max_attempts: int = 3) -> bool:
             wifi_ok = False
         bt_ok: bool = os.path.exists("/sys/class/bluetooth/hci0")
         if wifi_ok and bt_ok:
-            _execute_command("notify-send 'Wi-Fi Monitor' 'No hardware issue(s) found.' --urgency=low --icon=network-wireless", as_user=True)
+            _execute_command("notify-send 'Wi-Fi Monitor' 'No hardware issue(s) found.' --urgency=low --icon=network-wireless", as_user=True, capture=False)
             _log("+", "Connectivity verified.")
             return True
         if attempt < max_attempts:
@@ -106,7 +105,7 @@ def verify_connectivity(max_attempts: int = 3) -> bool:
         _log("-", "WiFi Controller is missing.")
     if not bt_ok:
         _log("-", "Bluetooth Controller is missing.")
-    _execute_command("notify-send 'Wi-Fi Monitor' 'Recovery failed' --urgency=critical --icon=dialog-error", as_user=True)
+    _execute_command("notify-send 'Wi-Fi Monitor' 'Recovery failed' --urgency=critical --icon=dialog-error", as_user=True, capture=False)
     return False
 
 
@@ -134,7 +133,6 @@ def _reset_sequence() -> bool:
 def al_is_watching() -> None:
     """Monitors journalctl for hardware hang signatures."""
     _log("+", "Starting WiFi Guardian Monitor...")
-    compiled_p_list: list[Pattern[str]] = [re.compile(p, re.IGNORECASE) for p in p_list]
     try:
         p = subprocess.Popen(["journalctl", "-k", "-f", "-n", "0", "--no-pager"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
         if p.stdout is None:
@@ -146,7 +144,7 @@ def al_is_watching() -> None:
             for pattern in compiled_p_list:
                 if pattern.search(line):
                     _log("-", f"Reset trigger: {line.strip()} (Pattern: {pattern.pattern})")
-                    _execute_command("notify-send 'Wi-Fi Monitor' 'Hang detected' --urgency=critical --icon=dialog-error", as_user=True)
+                    _execute_command("notify-send 'Wi-Fi Monitor' 'Hang detected' --urgency=critical --icon=dialog-error", as_user=True, capture=False)
                     _reset_sequence()
                     break
     except PermissionError: